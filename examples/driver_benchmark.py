@@ -0,0 +1,67 @@
+import struct
+import time
+
+from typing import Sequence
+
+from phalski_ledshim import animation, client, color, offline
+
+
+PIXEL = struct.Struct('4B')  # r, g, b and the brightness quantized to 8 bits
+
+
+class CountingDriver(client.NullDriver):
+    """Per-pixel driver counting the calls it receives
+
+    Pixels are written into a generic buffer of 4 bytes per pixel, which stands in for the per-pixel work of a real
+    driver. Transfers to the hardware are not simulated.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+        self.buffer = bytearray(PIXEL.size * self.num_pixels)
+
+    def set_pixel(self, x: int, r: int, g: int, b: int, brightness: float):
+        self.calls += 1
+        PIXEL.pack_into(self.buffer, x * PIXEL.size, r, g, b, int(brightness * 255))
+
+    def set_pixels(self, colors: Sequence[color.Color]):
+        client.Driver.set_pixels(self, colors)
+
+    def show(self):
+        self.calls += 1
+
+
+class CountingBulkDriver(CountingDriver):
+    """Driver accepting a complete frame with a single call, the whole frame is packed into the buffer"""
+
+    def set_pixels(self, colors: Sequence[color.Color]):
+        self.calls += 1
+        buffer = self.buffer
+        for x, c in enumerate(colors):
+            PIXEL.pack_into(buffer, x * PIXEL.size, c.r, c.g, c.b, int(c.brightness * 255))
+
+
+def benchmark(driver: CountingDriver, frames, n: int = 20):
+    c = client.Factory.client(driver=driver)
+    # the change events are created upfront, so only applying and showing the frames is timed
+    changes = [[client.Factory.change_event(x, i) for i, x in enumerate(frame)] for frame in frames]
+    driver.calls = 0
+    start = time.perf_counter()
+    for _ in range(n):
+        for frame_changes in changes:
+            c.apply_changes(frame_changes)
+            c.show()
+    elapsed = time.perf_counter() - start
+    num_frames = n * len(frames)
+    return driver.calls / num_frames, elapsed / num_frames * 1e6
+
+
+if __name__ == '__main__':
+    pixels = list(range(client.NullDriver().num_pixels))
+    for name, source in [('rainbow', animation.Rainbow(pixels, 60)), ('ledtest', animation.LedTest(pixels))]:
+        frames = offline.Factory.renderer().render(0.05, 200, source)
+        for driver in [CountingDriver(), CountingBulkDriver()]:
+            calls, us = benchmark(driver, frames)
+            print('%-8s %-18s %6.1f driver calls/frame %8.1f us/frame (apply, show and driver)' %
+                  (name, type(driver).__name__, calls, us))
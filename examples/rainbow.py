@@ -1,4 +1,3 @@
-import time
 import colorsys
 
 from typing import Sequence
@@ -20,7 +19,7 @@ class Rainbow(app.InfiniteColorSource):
         self._speed = speed
 
     def get_colors(self, num_pixels: int):
-        hue = int(time.time() * 100 * self._speed) % 360
+        hue = int(self.clock.time() * 100 * self._speed) % 360
 
         def get_color(i: int):
             offset = i * self._spacing
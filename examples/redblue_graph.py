@@ -1,15 +1,16 @@
 import math
-import time
 
 from phalski_ledshim import app, client, chart
 
 
-def value():
-    t = time.time()
+def value(t: float):
     return (math.sin(t) + 1) / 2
 
 
 if __name__ == '__main__':
     a = app.App()
-    a.configure_worker(0.1, chart.Factory.red_blue_bar_chart_source(a.pixels, value, lambda: 1 - value()))
+    # both bars read the same sample within a render, half the delay leaves room for scheduling jitter
+    registry = chart.Factory.sample_registry(0.05, a.clock)
+    wave = registry.register('wave', lambda: value(a.clock.time()))
+    a.configure_worker(0.1, chart.Factory.red_blue_bar_chart_source(a.pixels, wave, lambda: 1 - wave()))
     a.exec()
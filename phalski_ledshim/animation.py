@@ -1,14 +1,11 @@
 from __future__ import absolute_import
 
-import colorsys
-import time
-
 from typing import Sequence
 
-from phalski_ledshim import color, app
+from phalski_ledshim import color, app, client
 
 
-class Rainbow(app.InfiniteColorSource):
+class Rainbow(app.RenderSource):
 
     def __init__(self, pixels: Sequence[int], num_colors: int = 16, speed: float = 1.0):
         super().__init__(pixels)
@@ -20,26 +17,36 @@ class Rainbow(app.InfiniteColorSource):
 
         self._spacing = 360.0 / num_colors
         self._speed = speed
+        # the hue is quantized to full degrees, so all frames can be computed upfront
+        colors = {}
+        self._hue_colors = tuple(self._get_colors(hue, len(pixels), colors) for hue in range(360))
 
-    def get_colors(self, num_pixels: int):
-        hue = int(time.time() * 100 * self._speed) % 360
-
-        def get_color(i: int):
-            offset = i * self._spacing
-            h = ((hue + offset) % 360) / 360.0
-            r, g, b = [int(c * 255) for c in colorsys.hsv_to_rgb(h, 1.0, 1.0)]
-            return color.Factory.color(r, g, b)
+    def _get_colors(self, hue: int, num_pixels: int, colors: dict):
+        hues = [((hue + i * self._spacing) % 360) / 360.0 for i in range(num_pixels)]
+        # identical colors are shared between all frames
+        return [colors.setdefault(c, c) for c in color.Batch.colors(color.Batch.hsv(hues))]
 
-        return {i: get_color(i) for i in range(num_pixels)}
+    def render(self, frame: client.Frame) -> bool:
+        # the modulo is applied to the float, an int above 256 would be allocated per frame
+        frame.update(self._hue_colors[int(self.clock.time() * 100 * self._speed % 360)])
+        return True
 
 
-class LedTest(app.ColorSource):
+class LedTest(app.RenderSource):
 
     def __init__(self, pixels: Sequence[int]):
         super().__init__(pixels, True)
-
-    def colors(self, num_pixels: int):
-        for c in [color.Factory.color(255, 0, 0), color.Factory.color(0, 255, 0),
-                  color.Factory.color(0, 0, 255)]:
-            for i in range(num_pixels):
-                yield {i: c}
+        self._colors = (color.Factory.color(255, 0, 0), color.Factory.color(0, 255, 0),
+                        color.Factory.color(0, 0, 255))
+        self._step = 0
+
+    def render(self, frame: client.Frame) -> bool:
+        num_pixels = len(frame)
+        if self._step == len(self._colors) * num_pixels:
+            return False
+
+        i = self._step % num_pixels
+        frame.set(i - 1 if 0 < i else num_pixels - 1, self.clear_color)
+        frame.set(i, self._colors[self._step // num_pixels])
+        self._step += 1
+        return True
@@ -1,13 +1,14 @@
 from __future__ import absolute_import
 
 import abc
+import heapq
 import queue
 import threading
 import logging
 
-from typing import Generator, Optional, Sequence, List, Dict
+from typing import Generator, Optional, Sequence, List, Dict, Tuple, Union
 
-from phalski_ledshim import color, client as ledshim_client
+from phalski_ledshim import color, client as ledshim_client, clock as ledshim_clock, trace
 
 
 class SourceError(Exception):
@@ -18,6 +19,11 @@ class BaseColorSource(abc.ABC):
 
     def __init__(self):
         super().__init__()
+        self.clock = ledshim_clock.Factory.system_clock()
+
+    def set_clock(self, clock: ledshim_clock.Clock):
+        """Sets the clock the source reads the time from, the app sets its own clock on all its sources"""
+        self.clock = clock
 
     def open(self):
         pass
@@ -26,31 +32,100 @@ class BaseColorSource(abc.ABC):
     def events(self) -> Generator[List[ledshim_client.ChangeEvent], None, None]:
         pass
 
+    def timeout(self) -> Optional[float]:
+        """Seconds until the source has its next frame due or None if the source has no own schedule"""
+        return None
+
     def close(self):
         """Closes all resources used by the source (e.g. file handles, db connections, ...)"""
         pass
 
 
 class MultiSource(BaseColorSource):
+    """Multiplexes several sources with individual periods onto a single event stream
+
+    Sources are passed either as is or as a ``(source, period)`` tuple. Sources without an explicit period use the
+    default ``period``. On each frame only the sources which are due are advanced, all other sources contribute their
+    last frame. If no period is set at all, every source is advanced on every frame.
+    """
 
-    def __init__(self, *args: BaseColorSource):
+    def __init__(self, *args: Union[BaseColorSource, Tuple[BaseColorSource, float]], period: Optional[float] = None):
         super().__init__()
-        self.sources = list(args)
+        if period is not None and not 0 < period:
+            raise ValueError('period must be greater than 0: %f' % period)
 
-    def events(self) -> Generator[List[ledshim_client.ChangeEvent], None, None]:
-        event_generators = [source.events() for source in self.sources]
+        self.period = period
+        self.sources = []
+        self.periods = []
+        for arg in args:
+            source, source_period = arg if isinstance(arg, tuple) else (arg, period)
+            if source_period is not None and not 0 < source_period:
+                raise ValueError('period must be greater than 0: %f' % source_period)
 
-        while event_generators:
-            events = []
-            for i, generator in enumerate(event_generators):
+            self.sources.append(source)
+            self.periods.append(source_period)
+
+        self._schedule = []
+
+    def set_clock(self, clock: ledshim_clock.Clock):
+        super().set_clock(clock)
+        for source in self.sources:
+            source.set_clock(clock)
+
+    def timeout(self) -> Optional[float]:
+        if not self._schedule:
+            return None
+
+        return max(self._schedule[0][0] - self.clock.monotonic(), 0.0)
+
+    def events(self) -> Generator[List[ledshim_client.ChangeEvent], None, None]:
+        sources = list(self.sources)
+        event_generators = [source.events() for source in sources]
+        frames = [[] for _ in sources]
+
+        # entries are (due, index) tuples, the index is unique and breaks ties on equal due times
+        now = self.clock.monotonic()
+        self._schedule = [(now, i) for i, p in enumerate(self.periods) if p is not None]
+        heapq.heapify(self._schedule)
+        unscheduled = [i for i, p in enumerate(self.periods) if p is None]
+
+        active = len(sources)
+        while active:
+            now = self.clock.monotonic()
+            due = [(now, i) for i in unscheduled]
+            while self._schedule and self._schedule[0][0] <= now:
+                due.append(heapq.heappop(self._schedule))
+
+            finished = []
+            for t, i in due:
                 try:
-                    events += next(generator)
+                    frames[i] = next(event_generators[i])
                 except StopIteration:
-                    event_generators.remove(generator)
-                    self.sources.pop(i).close()
+                    finished.append(i)
+                    continue
+
+                period = self.periods[i]
+                if period is not None:
+                    # keep the cadence of the source but skip frames which have already been missed
+                    t += period
+                    heapq.heappush(self._schedule, (t if now < t else now + period, i))
+
+            for i in finished:
+                frames[i] = []
+                if i in unscheduled:
+                    unscheduled.remove(i)
+                self.sources.remove(sources[i])
+                sources[i].close()
+                active -= 1
+
+            events = []
+            for frame in frames:
+                events += frame
 
             yield events
 
+        self._schedule = []
+
     def close(self):
         for source in self.sources:
             source.close()
@@ -107,15 +182,66 @@ class InfiniteColorSource(ColorSource):
         pass
 
 
+class RenderSource(BaseColorSource):
+    """Abstract base class for algorithms that render a specific range of pixels into a reusable frame buffer
+
+    In contrast to ColorSource no objects are created per frame by the framework. The source is handed a frame which
+    already holds the last rendered colors, updates it in place and marks the changed range.
+    """
+
+    def __init__(self, pixels: Sequence[int], clear: bool = False,
+                 clear_color: color.Color = color.Factory.color(0, 0, 0)):
+        super().__init__()
+        assert pixels
+        self.pixels = pixels
+        self.clear_color = clear_color
+        self.clear = clear
+        # frames are double buffered, the frame most recently handed out may still be applied by the app thread
+        self._frames = (ledshim_client.Frame(pixels, clear_color), ledshim_client.Frame(pixels, clear_color))
+        self._events = ([self._frames[0]], [self._frames[1]])
+
+    @abc.abstractmethod
+    def render(self, frame: ledshim_client.Frame) -> bool:
+        """Renders the next frame in place
+
+        :param frame: The frame holding the last rendered colors, changes have to be marked
+        :return: False if the source is exhausted, otherwise True
+        """
+        pass
+
+    def events(self) -> Generator[List[ledshim_client.Frame], None, None]:
+        n = 0
+        while True:
+            frame, last = self._frames[n], self._frames[n ^ 1]
+            # bring the back buffer up to date with the changes of the last frame
+            for i in range(last.start, last.stop):
+                frame.colors[i] = last.colors[i]
+            frame.reset()
+
+            if not self.render(frame):
+                break
+
+            yield self._events[n]
+            n ^= 1
+
+        if self.clear:
+            frame.fill(self.clear_color)
+            yield self._events[n]
+
+
 class Worker(threading.Thread):
 
-    def __init__(self, name: str, source: BaseColorSource, shutdown: threading.Event, delay: float):
+    def __init__(self, name: str, source: BaseColorSource, shutdown: threading.Event, delay: float,
+                 tracer: Optional[trace.Tracer] = None, clock: Optional[ledshim_clock.Clock] = None):
         super().__init__(name=name)
         self.log = logging.getLogger('%s.%s_%s' % (__name__, self.__class__.__name__, self.name))
-        self.queue = queue.Queue(1)
+        self.queue = queue.Queue(1)  # holds (frame id, queued span start, changes) tuples
+        self.picked_up = threading.Event()  # set by the app when it took the queued changes
         self.shutdown = shutdown
         self.delay = delay
         self.source = source
+        self.tracer = tracer or trace.Tracer()
+        self.clock = clock or ledshim_clock.Factory.system_clock()
 
     def run(self):
         try:
@@ -129,14 +255,26 @@ class Worker(threading.Thread):
         while not self.shutdown.is_set():
             if self.queue.empty():
                 try:
-                    self.queue.put(next(events))
+                    frame_id = self.tracer.next_frame_id()
+                    started = self.tracer.begin(frame_id)
+                    changes = next(events)
+                    self.tracer.end('render', frame_id, started)
+                    self.picked_up.clear()
+                    self.queue.put((frame_id, self.tracer.begin(frame_id), changes))
                 except SourceError:
                     self.log.exception('Failed to get events from source')
                     break
                 except StopIteration:
                     break
 
-            self.shutdown.wait(self.delay)
+            # the delay is an upper bound, scheduled sources may request an earlier wake up
+            timeout = self.source.timeout()
+            wait = self.delay if timeout is None else min(timeout, self.delay)
+            if 0 < wait or self.queue.empty():
+                self.clock.wait(self.shutdown, wait)
+            else:
+                # a frame is due, but the app has not picked up the last one yet
+                self.clock.wait(self.picked_up, self.delay)
 
         self.source.close()
 
@@ -147,10 +285,21 @@ class Worker(threading.Thread):
 
 
 class App(threading.Thread):
+    """Runs the configured workers and shows their frames in real time
+
+    The clock is shared by the app and all workers, which wait on it concurrently. A VirtualClock would be advanced by
+    every waiting thread and is rejected, use offline.Renderer to render against virtual time.
+    """
+
+    def __init__(self, delay: float = 1 / 16, client: Optional[ledshim_client.Client] = None,
+                 tracer: Optional[trace.Tracer] = None, clock: Optional[ledshim_clock.Clock] = None):
+        if isinstance(clock, ledshim_clock.VirtualClock):
+            raise ValueError('App requires a real-time clock, render with offline.Renderer instead: %s' % clock)
 
-    def __init__(self, delay: float = 1 / 16, client: Optional[ledshim_client.Client] = None):
         super().__init__()
         self.client = client or ledshim_client.Factory.client()
+        self.tracer = tracer or trace.Tracer()
+        self.clock = clock or ledshim_clock.Factory.system_clock()
         self.delay = delay
         self.shutdown = threading.Event()
         self.workers = []
@@ -160,8 +309,15 @@ class App(threading.Thread):
     def pixels(self):
         return self.client.pixels
 
-    def configure_worker(self, delay: float, *args: BaseColorSource):
-        self.workers.append(Worker('<%d>' % len(self.workers), MultiSource(*args), self.shutdown, delay))
+    def configure_worker(self, delay: float, *args: Union[BaseColorSource, Tuple[BaseColorSource, float]]):
+        """Adds a worker running all given sources on a single thread
+
+        Sources may be given as ``(source, period)`` tuples to run at their own rate, all other sources run at the
+        rate given by ``delay``.
+        """
+        source = MultiSource(*args, period=delay)
+        source.set_clock(self.clock)
+        self.workers.append(Worker('<%d>' % len(self.workers), source, self.shutdown, delay, self.tracer, self.clock))
 
     def run(self):
 
@@ -171,12 +327,17 @@ class App(threading.Thread):
 
         self.log.info('Started - delay=%.2f' % self.delay)
         while self.workers and not self.shutdown.is_set():
-            show = False
+            shown = []
             for worker in self.workers:
                 try:
-                    changes = worker.queue.get_nowait()
-                    show = True
+                    frame_id, queued, changes = worker.queue.get_nowait()
+                    worker.picked_up.set()
+                    # the queued span is recorded on the worker thread, which is idle until the frame is picked up
+                    self.tracer.end('queue', frame_id, queued, worker.ident)
+                    shown.append(frame_id)
+                    started = self.tracer.begin(frame_id)
                     self.client.apply_changes(changes)
+                    self.tracer.end('apply_changes', frame_id, started)
                 except queue.Empty:
                     pass
 
@@ -185,10 +346,12 @@ class App(threading.Thread):
                     self.log.info(
                         'Worker_%s finished, there are %d active workers remaining' % (worker.name, len(self.workers)))
 
-            if show:
+            if shown:
+                started = self.tracer.begin(*shown)
                 self.client.show()
+                self.tracer.end('show', shown, started)
 
-            self.shutdown.wait(self.delay)
+            self.clock.wait(self.shutdown, self.delay)
 
         if self.shutdown.is_set():
             self.log.info('Stopped')
@@ -1,12 +1,13 @@
 from __future__ import absolute_import
 
 import abc
+import threading
 
 from typing import Callable, Dict, NamedTuple, Optional, Sequence, Tuple
 
-from phalski_ledshim import color, app
+from phalski_ledshim import color, app, client, clock as ledshim_clock
 
-__all__ = ['Chart', 'Factory']
+__all__ = ['Chart', 'Factory', 'SampleRegistry']
 
 
 class ValueSpecification(NamedTuple('ValueSpecification',
@@ -31,34 +32,43 @@ class ValueSpecification(NamedTuple('ValueSpecification',
 
 
 class Chart(abc.ABC):
+    """Abstract base class for charts
+
+    Charts render into the preallocated colors list. Implementations only assign colors which were created upfront
+    or are cached, so rendering does not create objects per frame.
+    """
 
     def __init__(self, length: int, fg_color: color.Color, bg_color: color.Color, *args: ValueSpecification):
         self.colors = [color.NamedColor.BLACK] * length
         self.fg_color = fg_color
         self.bg_color = bg_color
         self.value_specs = args
+        self.values = [0.0] * len(args)
 
-    def validate_and_process_values(self, *args: float):
+    def validate_and_process_values(self, values: Sequence[float]) -> Sequence[float]:
         num_specs = len(self.value_specs)
-        num_values = len(args)
+        num_values = len(values)
         if not num_specs == num_values:
             raise ValueError('Illegal number of values: expected=%d actual=%d' % (num_specs, num_values))
 
-        value_list = list(args)
-        for i, spec in enumerate(self.value_specs):
+        processed = self.values
+        for i in range(num_specs):
             try:
-                value_list[i] = spec.apply(value_list[i])
+                processed[i] = self.value_specs[i].apply(values[i])
             except ValueError as e:
-                raise ValueError('Failed to process value %d=%f' % (i, value_list[i]), e)
+                raise ValueError('Failed to process value %d=%f' % (i, values[i]), e)
 
-        return tuple(value_list)
+        return processed
 
     def set_values(self, *args: float):
-        values = self.validate_and_process_values(*args)
-        return self.apply_values(*values)
+        return self.update(args)
+
+    def update(self, values: Sequence[float]):
+        """Same as set_values, but takes the values as a sequence which avoids packing them into a tuple per frame"""
+        return self.apply_values(self.validate_and_process_values(values))
 
     @abc.abstractmethod
-    def apply_values(self, *args: float):
+    def apply_values(self, values: Sequence[float]):
         pass
 
 
@@ -66,13 +76,14 @@ class BarChart(Chart):
 
     def __init__(self, length: int, fg_color: color.Color, bg_color: color.Color, spec: ValueSpecification):
         super().__init__(length, fg_color, bg_color, Factory.spec_normalized(spec))
+        # shades are quantized to 8 bits, which matches the resolution of a fully saturated channel
+        self.shades = tuple(color.Factory.shade(fg_color, i / 255) for i in range(256))
 
-    def apply_values(self, *args: float):
-        v, = args
-        v *= len(self.colors)
+    def apply_values(self, values: Sequence[float]):
+        v = values[0] * len(self.colors)
 
         for i in range(len(self.colors)):
-            self.colors[i] = self.bg_color if v <= 0 else color.Factory.shade(self.fg_color, min(v, 1.0))
+            self.colors[i] = self.bg_color if v <= 0 else self.shades[int(min(v, 1.0) * 255)]
             v -= 1
 
 
@@ -83,14 +94,27 @@ class RedBlueBarChart(Chart):
         c = color.Factory.color(255, 0, 255, brightness)
         super().__init__(length, c, color.Factory.shade(c, bg_shade), Factory.spec_normalized(red),
                          Factory.spec_normalized(blue))
+        self.color_cache = {}  # red -> blue -> color
+
+    def get_color(self, r: int, b: int) -> color.Color:
+        row = self.color_cache.get(r)
+        if row is None:
+            row = self.color_cache[r] = {}
+
+        c = row.get(b)
+        if c is None:
+            c = row[b] = color.Factory.color(r, 0, b, self.fg_color.brightness)
 
-    def apply_values(self, *args: float):
-        red, blue = (len(self.colors) * v for v in args)
+        return c
+
+    def apply_values(self, values: Sequence[float]):
+        red = values[0] * len(self.colors)
+        blue = values[1] * len(self.colors)
 
         for i in range(len(self.colors)):
             r = self.bg_color.r if red <= 0 else int(self.fg_color.r * min(red, 1.0))
             b = self.bg_color.b if blue <= 0 else int(self.fg_color.b * min(blue, 1.0))
-            self.colors[i] = color.Factory.color(r, 0, b, self.fg_color.brightness)
+            self.colors[i] = self.get_color(r, b)
 
             red -= 1
             blue -= 1
@@ -100,13 +124,17 @@ class BinNumber(Chart):
 
     def __init__(self, length: int, capped: bool, fg_color: color.Color, bg_color: color.Color):
         super().__init__(length, fg_color, bg_color, Factory.spec(0.0, (1 << length) - 1, capped, False))
+        self.powers = tuple(float(1 << i) for i in range(length))
+
+    def is_set(self, v: float, i: int) -> bool:
+        # float arithmetic avoids creating int objects for large numbers
+        return 1.0 <= v // self.powers[i] % 2.0
 
-    def apply_values(self, *args: float):
-        v, = args
-        n = int(v)
+    def apply_values(self, values: Sequence[float]):
+        v = float(values[0])
 
         for i in range(len(self.colors)):
-            self.colors[i] = self.fg_color if 0 < 1 << i & n else self.bg_color
+            self.colors[i] = self.fg_color if self.is_set(v, i) else self.bg_color
 
 
 class RedBlueBinNumber(Chart):
@@ -115,14 +143,20 @@ class RedBlueBinNumber(Chart):
         c = color.Factory.color(255, 0, 255, brightness)
         s = Factory.spec(0.0, (1 << length) - 1, capped, False)
         super().__init__(length, c, color.Factory.shade(c, bg_shade), s, s)
+        self.powers = tuple(float(1 << i) for i in range(length))
+        fg, bg = self.fg_color, self.bg_color
+        # indexed by (red bit, blue bit)
+        self.bit_colors = ((color.Factory.color(bg.r, 0, bg.b, fg.brightness),
+                            color.Factory.color(bg.r, 0, fg.b, fg.brightness)),
+                           (color.Factory.color(fg.r, 0, bg.b, fg.brightness),
+                            color.Factory.color(fg.r, 0, fg.b, fg.brightness)))
 
-    def apply_values(self, *args: float):
-        red, blue = (int(v) for v in args)
+    def apply_values(self, values: Sequence[float]):
+        red, blue = float(values[0]), float(values[1])
 
         for i in range(len(self.colors)):
-            r = self.fg_color.r if 0 < 1 << i & red else self.bg_color.r
-            b = self.fg_color.b if 0 < 1 << i & blue else self.bg_color.b
-            self.colors[i] = color.Factory.color(r, 0, b, self.fg_color.brightness)
+            p = self.powers[i]
+            self.colors[i] = self.bit_colors[1.0 <= red // p % 2.0][1.0 <= blue // p % 2.0]
 
 
 class SingleStat(Chart):
@@ -132,31 +166,99 @@ class SingleStat(Chart):
         super().__init__(length, default_color, default_color, spec)
         self.color_specs = sorted(args, key=lambda x: x[0])
 
-    def apply_values(self, *args: float):
-        v, = args
+    def apply_values(self, values: Sequence[float]):
+        v = values[0]
 
+        # color specs are sorted by threshold, the last one reached is selected
         selected_color = self.fg_color
-        if self.color_specs:
-            for spec in reversed(self.color_specs):
-                t, c = spec
-                if t <= v:
-                    selected_color = c
-                    break
+        for t, c in self.color_specs:
+            if v < t:
+                break
+            selected_color = c
 
         for i in range(len(self.colors)):
             self.colors[i] = selected_color
 
 
-class ChartSource(app.InfiniteColorSource):
+class ChartSource(app.RenderSource):
 
     def __init__(self, pixels: Sequence[int], chart: Chart, *args: Callable[[], float]):
         super().__init__(pixels, True, chart.bg_color)
         self.chart = chart
         self.value_sources = args
+        self._samples = [0.0] * len(args)
+
+    def render(self, frame: client.Frame) -> bool:
+        samples = self._samples
+        for i in range(len(samples)):
+            samples[i] = self.value_sources[i]()
+
+        self.chart.update(samples)
+        frame.update(self.chart.colors)
+        return True
+
+
+class Metric:
+
+    def __init__(self, sampler: Callable[[], float], ttl: float):
+        self.sampler = sampler
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.sample = None  # type: Optional[Tuple[float, float]]
+
+
+class SampleRegistry:
+    """Registry sharing the values of named metrics between all charts and workers reading them
+
+    Each metric is sampled at most once per ttl, all reads within that time return the same value. The registry is
+    safe to use from multiple workers: reads of a fresh value do not lock and concurrent reads of a stale value result
+    in a single sample.
 
-    def get_colors(self, num_pixels: int) -> Dict[int, color.Color]:
-        self.chart.set_values(*(s() for s in self.value_sources))
-        return {i: self.chart.colors[i] for i in range(num_pixels)}
+    A sample expires ttl after it was taken, so a ttl equal to the worker delay makes renders which are scheduled a bit
+    early reuse the value of the previous render. To sample once per render, choose a ttl shorter than the delay by
+    more than the scheduling jitter of the workers, e.g. half the delay.
+    """
+
+    def __init__(self, ttl: float, clock: Optional[ledshim_clock.Clock] = None):
+        if not 0.0 < ttl:
+            raise ValueError('ttl must be greater than 0: %f' % ttl)
+
+        self.ttl = ttl
+        self.clock = clock or ledshim_clock.Factory.system_clock()
+        self.metrics = {}  # type: Dict[str, Metric]
+
+    def register(self, name: str, sampler: Callable[[], float], ttl: Optional[float] = None) -> Callable[[], float]:
+        """Registers a metric and returns a value source reading it, see source"""
+        if ttl is not None and not 0.0 < ttl:
+            raise ValueError('ttl must be greater than 0: %f' % ttl)
+
+        if name in self.metrics:
+            raise ValueError('Metric already registered: %s' % name)
+
+        self.metrics[name] = Metric(sampler, self.ttl if ttl is None else ttl)
+        return self.source(name)
+
+    def source(self, name: str) -> Callable[[], float]:
+        if name not in self.metrics:
+            raise KeyError('Unknown metric: %s' % name)
+
+        return lambda: self.get(name)
+
+    def get(self, name: str) -> float:
+        metric = self.metrics[name]
+
+        sample = metric.sample
+        if sample is not None and self.clock.monotonic() < sample[0]:
+            return sample[1]
+
+        with metric.lock:
+            # another thread may have sampled while this one was waiting for the lock
+            sample = metric.sample
+            now = self.clock.monotonic()
+            if sample is None or sample[0] <= now:
+                sample = metric.sample = (now + metric.ttl, metric.sampler())
+
+        return sample[1]
 
 
 class Factory(abc.ABC):
@@ -174,6 +276,10 @@ class Factory(abc.ABC):
     def spec_normalized(cls, spec: ValueSpecification) -> ValueSpecification:
         return cls.spec(spec.min, spec.max, spec.is_capped, True)
 
+    @classmethod
+    def sample_registry(cls, ttl: float, clock: Optional[ledshim_clock.Clock] = None) -> SampleRegistry:
+        return SampleRegistry(ttl, clock)
+
     @classmethod
     def bar_chart_source(cls, pixels: Sequence[int],
                          value_source: Callable[[], float],
@@ -1,9 +1,8 @@
 from __future__ import absolute_import
 
 import abc
-import ledshim
 
-from typing import NamedTuple, List, Sequence
+from typing import NamedTuple, List, Optional, Sequence, Tuple, Union
 
 from phalski_ledshim import color
 
@@ -17,54 +16,208 @@ class ChangeEvent(NamedTuple('ChangeEvent', [('pixels', List[int]), ('color', co
     """
 
 
+class Frame:
+    """Reusable frame buffer for a range of pixels
+
+    Sources render into ``colors`` and mark the range of indices they changed, only the marked range is applied to
+    the client. Frames are owned by the framework and reused for all subsequent frames of a source.
+    """
+    __slots__ = ('pixels', 'colors', 'start', 'stop')
+
+    def __init__(self, pixels: Sequence[int], fill: color.Color):
+        self.pixels = pixels
+        self.colors = [fill] * len(pixels)
+        self.start = 0
+        self.stop = 0
+
+    def __len__(self):
+        return len(self.colors)
+
+    def is_changed(self) -> bool:
+        return self.start < self.stop
+
+    def set(self, i: int, c: color.Color):
+        self.colors[i] = c
+        self.mark(i, i + 1)
+
+    def update(self, colors: Sequence[color.Color]):
+        """Copies all colors in place, slice assignment would allocate a temporary buffer for larger frames"""
+        for i in range(len(self.colors)):
+            self.colors[i] = colors[i]
+        self.mark(0, len(self.colors))
+
+    def fill(self, c: color.Color):
+        for i in range(len(self.colors)):
+            self.colors[i] = c
+        self.mark(0, len(self.colors))
+
+    def mark(self, start: int, stop: int):
+        if not self.start < self.stop:
+            self.start = start
+            self.stop = stop
+            return
+
+        if start < self.start:
+            self.start = start
+        if self.stop < stop:
+            self.stop = stop
+
+    def reset(self):
+        self.start = 0
+        self.stop = 0
+
+
+NUM_PIXELS = 28  # number of pixels of the LED SHIM
+
+
+class Driver(abc.ABC):
+    """Output layer of the client
+
+    Drivers receive the complete frame with a single set_pixels call on each show. Drivers which only support
+    per-pixel writes implement set_pixel and use the default set_pixels, which writes the changed pixels only.
+    """
+
+    def __init__(self, num_pixels: int):
+        self.num_pixels = num_pixels
+        self._written = [None] * num_pixels
+
+    @abc.abstractmethod
+    def set_clear_on_exit(self, value: bool):
+        pass
+
+    @abc.abstractmethod
+    def set_brightness(self, brightness: float):
+        pass
+
+    @abc.abstractmethod
+    def set_pixel(self, x: int, r: int, g: int, b: int, brightness: float):
+        pass
+
+    def set_pixels(self, colors: Sequence[color.Color]):
+        written = self._written
+        for x, c in enumerate(colors):
+            if c != written[x]:
+                written[x] = c
+                self.set_pixel(x, c.r, c.g, c.b, c.brightness)
+
+    @abc.abstractmethod
+    def show(self):
+        pass
+
+
+class LedShimDriver(Driver):
+    """Driver for the Pimoroni LED SHIM, which only supports per-pixel writes"""
+
+    def __init__(self):
+        # imported lazily, so the rest of the package can be used without the hardware driver installed
+        import ledshim
+        super().__init__(ledshim.NUM_PIXELS)
+        self._ledshim = ledshim
+
+    def set_clear_on_exit(self, value: bool):
+        self._ledshim.set_clear_on_exit(value)
+
+    def set_brightness(self, brightness: float):
+        self._ledshim.set_brightness(brightness)
+
+    def set_pixel(self, x: int, r: int, g: int, b: int, brightness: float):
+        self._ledshim.set_pixel(x, r, g, b, brightness)
+
+    def show(self):
+        self._ledshim.show()
+
+
+class NullDriver(Driver):
+    """Driver discarding all output, e.g. for offline rendering"""
+
+    def __init__(self, num_pixels: int = NUM_PIXELS):
+        super().__init__(num_pixels)
+
+    def set_clear_on_exit(self, value: bool):
+        pass
+
+    def set_brightness(self, brightness: float):
+        pass
+
+    def set_pixel(self, x: int, r: int, g: int, b: int, brightness: float):
+        pass
+
+    def set_pixels(self, colors: Sequence[color.Color]):
+        pass
+
+    def show(self):
+        pass
+
+
 class Client:
     """Client encapsulating all ledshim operations
 
-    The client exports a subset of the original ledshim driver object api
+    The client exports a subset of the original ledshim driver object api. Pixel changes are collected in a back
+    buffer and handed to the driver as a complete frame on show. Only a single thread may write to the client, but any
+    thread can read the shown frame from state or snapshot without locking: show publishes an immutable copy of the
+    back buffer with a single reference assignment. Colors are stored as PackedColor encoded at the client depth.
     """
 
     def __init__(self, brightness: float = color.Factory.MAX_BRIGHTNESS, clear_on_exit: bool = True,
-                 depth: color.Depth = color.Depth.BIT24):
+                 depth: color.Depth = color.Depth.BIT24, driver: Optional[Driver] = None):
         self.brightness = 0.0
         self.clear_on_exit = True
         self.depth = depth
-        self.pixels = list(range(ledshim.NUM_PIXELS))
-        self.state = [color.Factory.color(0, 0, 0, 0.0, self.depth)] * ledshim.NUM_PIXELS
+        self.driver = driver or LedShimDriver()
+        self.pixels = list(range(self.driver.num_pixels))
+        self._back = [color.Factory.packed_color(0, 0, 0, 0.0, self.depth)] * self.driver.num_pixels
+        self._front = (0, tuple(self._back))
 
         self.set_brightness(brightness)
         self.set_clear_on_exit(clear_on_exit)
 
-    def apply_changes(self, changes: Sequence[ChangeEvent]):
+    @property
+    def state(self) -> Tuple[color.PackedColor, ...]:
+        """The colors of the last shown frame"""
+        return self._front[1]
+
+    def snapshot(self) -> Tuple[int, Tuple[color.PackedColor, ...]]:
+        """Returns the sequence number and the colors of the last shown frame"""
+        return self._front
+
+    def apply_changes(self, changes: Sequence[Union[ChangeEvent, Frame]]):
         for c in changes:
-            for x in c.pixels:
-                self.set_pixel(x, c.color)
+            if isinstance(c, Frame):
+                self.apply_frame(c)
+            else:
+                for x in c.pixels:
+                    self.set_pixel(x, c.color)
+
+    def apply_frame(self, frame: Frame):
+        for i in range(frame.start, frame.stop):
+            self.set_pixel(frame.pixels[i], frame.colors[i])
 
     def set_clear_on_exit(self, value: bool = True):
         self.clear_on_exit = value
-        ledshim.set_clear_on_exit(value)
+        self.driver.set_clear_on_exit(value)
 
     def set_brightness(self, brightness: float):
         if 0 > brightness or brightness > color.Factory.MAX_BRIGHTNESS:
             raise ValueError("Illegal brightness value: %f" % brightness)
 
         self.brightness = brightness
-        ledshim.set_brightness(brightness)
+        self.driver.set_brightness(brightness)
 
     def set_pixel(self, x: int, c: color.Color):
-        c = color.Factory.encode(c, self.depth)
-        self.state[x] = c
-        ledshim.set_pixel(x, c.r, c.g, c.b, c.brightness)
+        self._back[x] = color.Factory.encode_packed(c, self.depth)
 
     def set_all(self, c: color.Color):
-        c = color.Factory.encode(c, self.depth)
-        ledshim.set_all(c.r, c.g, c.b, c.brightness)
+        self._back[:] = [color.Factory.encode_packed(c, self.depth)] * len(self.pixels)
 
     def clear(self):
-        self.state = [color.Factory.color(0, 0, 0, 0.0, self.depth)] * ledshim.NUM_PIXELS
-        ledshim.clear()
+        self._back[:] = [color.Factory.packed_color(0, 0, 0, 0.0, self.depth)] * len(self.pixels)
 
     def show(self):
-        ledshim.show()
+        seq, _ = self._front
+        front = tuple(self._back)
+        self.driver.set_pixels(front)
+        self.driver.show()
+        self._front = (seq + 1, front)
 
 
 class Factory(abc.ABC):
@@ -73,8 +226,9 @@ class Factory(abc.ABC):
     def client(cls,
                brightness: float = color.Factory.MAX_BRIGHTNESS,
                clear_on_exit: bool = True,
-               depth: color.Depth = color.Depth.BIT24) -> Client:
-        return Client(brightness, clear_on_exit, depth)
+               depth: color.Depth = color.Depth.BIT24,
+               driver: Optional[Driver] = None) -> Client:
+        return Client(brightness, clear_on_exit, depth, driver)
 
     @classmethod
     def change_event(cls, pixel_color: color.Color, *args: int):
@@ -0,0 +1,78 @@
+from __future__ import absolute_import
+
+import abc
+import threading
+import time
+
+__all__ = ['Clock', 'Factory']
+
+
+class Clock(abc.ABC):
+    """Time source used for pacing workers and animating sources"""
+
+    @abc.abstractmethod
+    def time(self) -> float:
+        """Returns the current time in seconds since the epoch"""
+        pass
+
+    @abc.abstractmethod
+    def monotonic(self) -> float:
+        """Returns the current time of a clock which cannot go backwards"""
+        pass
+
+    @abc.abstractmethod
+    def wait(self, event: threading.Event, timeout: float) -> bool:
+        """Waits until the event is set or the timeout elapsed
+
+        :return: True if the event is set, otherwise False
+        """
+        pass
+
+
+class SystemClock(Clock):
+
+    def time(self) -> float:
+        return time.time()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def wait(self, event: threading.Event, timeout: float) -> bool:
+        return event.wait(timeout)
+
+
+class VirtualClock(Clock):
+    """Clock which only advances when told to, waiting does not block but advances the clock"""
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        if 0.0 > seconds:
+            raise ValueError('Negative time delta: %f' % seconds)
+
+        self.now += seconds
+
+    def wait(self, event: threading.Event, timeout: float) -> bool:
+        if not event.is_set():
+            self.advance(timeout)
+
+        return event.is_set()
+
+
+class Factory(abc.ABC):
+    SYSTEM_CLOCK = SystemClock()
+
+    @classmethod
+    def system_clock(cls) -> SystemClock:
+        return cls.SYSTEM_CLOCK
+
+    @classmethod
+    def virtual_clock(cls, start: float = 0.0) -> VirtualClock:
+        return VirtualClock(start)
@@ -1,8 +1,17 @@
 import abc
+import array
+import colorsys
 import enum
-from typing import NamedTuple
+import itertools
+import math
+from typing import Dict, NamedTuple, Sequence, Tuple, Union
 
-__all__ = ['Depth', 'Factory', 'NamedColor']
+try:
+    import numpy
+except ImportError:  # numpy is optional, batch conversions fall back to lookup tables
+    numpy = None
+
+__all__ = ['Batch', 'Depth', 'Factory', 'Gradient', 'NamedColor', 'PackedColor']
 
 
 class Depth(enum.Enum):
@@ -78,6 +87,13 @@ class DepthMapper(object):
         except IndexError as e:
             raise ValueError('No mapping found for: target_depth=%d' % target_depth_bits, e)
 
+    def quantization(self, target_depth_bits: int) -> Tuple[int, ...]:
+        """Returns the table mapping max depth values to the closest value available at the target depth"""
+        try:
+            return self._maps[target_depth_bits - 1][0]
+        except IndexError as e:
+            raise ValueError('No mapping found for: target_depth=%d' % target_depth_bits, e)
+
 
 class Color(NamedTuple('Color', (('r', int), ('g', int), ('b', int), ('brightness', float),
                                         ('depth', Depth)))):
@@ -88,9 +104,66 @@ class Color(NamedTuple('Color', (('r', int), ('g', int), ('b', int), ('brightnes
     pass
 
 
+class PackedColor(int):
+    """Compact color representation packed into a single int
+
+    Layout is ``depth << 32 | r << 24 | g << 16 | b << 8 | brightness`` with the brightness quantized to 8 bits.
+    Equality and hashing are those of int. Provides the same attributes as Color, so it can be used wherever a Color is
+    used.
+
+    The client stores its frames packed (see Factory.encode_packed), which keeps the per pixel change detection of the
+    drivers to int comparisons. A PackedColor never equals a Color, use Factory.pack or unpack to compare both.
+    """
+    __slots__ = ()
+
+    DEPTHS = tuple(Depth)
+    DEPTH_INDEX = {d: i for i, d in enumerate(DEPTHS)}
+    BRIGHTNESS_MAX = 255
+
+    @classmethod
+    def of(cls, r: int, g: int, b: int, brightness: float, depth: Depth) -> 'PackedColor':
+        if not (0 <= r <= 0xff and 0 <= g <= 0xff and 0 <= b <= 0xff):
+            raise ValueError('Illegal color component value: r=%d, g=%d, b=%d' % (r, g, b))
+
+        if 0.0 > brightness or brightness > 1.0:
+            raise ValueError('Illegal brightness value: %f' % brightness)
+
+        q = int(round(brightness * cls.BRIGHTNESS_MAX))
+        return cls(cls.DEPTH_INDEX[depth] << 32 | r << 24 | g << 16 | b << 8 | q)
+
+    @property
+    def r(self) -> int:
+        return self >> 24 & 0xff
+
+    @property
+    def g(self) -> int:
+        return self >> 16 & 0xff
+
+    @property
+    def b(self) -> int:
+        return self >> 8 & 0xff
+
+    @property
+    def brightness(self) -> float:
+        return (self & 0xff) / self.BRIGHTNESS_MAX
+
+    @property
+    def depth(self) -> Depth:
+        return self.DEPTHS[self >> 32]
+
+    def _replace(self, **kwargs) -> 'PackedColor':
+        return self.of(kwargs.get('r', self.r), kwargs.get('g', self.g), kwargs.get('b', self.b),
+                       kwargs.get('brightness', self.brightness), kwargs.get('depth', self.depth))
+
+    def __repr__(self):
+        return 'PackedColor(r=%d, g=%d, b=%d, brightness=%.3f, depth=%s)' % (self.r, self.g, self.b, self.brightness,
+                                                                          self.depth)
+
+
 class Factory(abc.ABC):
     MAX_BRIGHTNESS = 1.0  # LED SHIM brightness is a value between 0.0 and 1.0
     DEPTH_MAPPER = DepthMapper()  # init static mapping tables
+    PACKED_ENCODINGS = {}  # type: Dict[Depth, Tuple[int, Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]]]
 
     @classmethod
     def color(cls, r: int, g: int, b: int, brightness: float = MAX_BRIGHTNESS,
@@ -120,14 +193,78 @@ class Factory(abc.ABC):
 
         return Color(red, green, blue, brightness, depth)
 
+    @classmethod
+    def gradient(cls, *args: Color, size: int = 256, depth: Depth = Depth.max_depth()) -> 'Gradient':
+        """Creates a gradient through the given colors with evenly spaced stops"""
+        if len(args) == 1:
+            return Gradient([(0.0, args[0])], size, depth)
+
+        return Gradient([(i / (len(args) - 1), c) for i, c in enumerate(args)], size, depth)
+
+    @classmethod
+    def packed_color(cls, r: int, g: int, b: int, brightness: float = MAX_BRIGHTNESS,
+                     depth=Depth.max_depth()) -> PackedColor:
+        """Creates a new PackedColor for the given args, see color"""
+        return cls.pack(cls.color(r, g, b, brightness, depth))
+
+    @classmethod
+    def pack(cls, color: Union[Color, PackedColor]) -> PackedColor:
+        if isinstance(color, PackedColor):
+            return color
+
+        return PackedColor.of(color.r, color.g, color.b, color.brightness, color.depth)
+
+    @classmethod
+    def unpack(cls, color: Union[Color, PackedColor]) -> Color:
+        if isinstance(color, Color):
+            return color
+
+        return Color(color.r, color.g, color.b, color.brightness, color.depth)
+
     @classmethod
     def encode(cls, color: Color, depth: Depth) -> Color:
+        if isinstance(color, PackedColor):
+            return cls.encode_packed(color, depth)
+
         return color._replace(
             r=Factory.DEPTH_MAPPER.get_value(color.r, Depth.max_depth().r, depth.r),
             g=Factory.DEPTH_MAPPER.get_value(color.g, Depth.max_depth().g, depth.g),
             b=Factory.DEPTH_MAPPER.get_value(color.b, Depth.max_depth().b, depth.b),
             depth=depth)
 
+    @classmethod
+    def encode_packed(cls, color: Union[Color, PackedColor], depth: Depth) -> PackedColor:
+        """Encodes a color for the given depth into a PackedColor
+
+        Same as pack(encode(color, depth)), but the channels are looked up in precomputed tables for the depth.
+
+        :raises ValueError: If color saturation or brightness values are not allowed
+        """
+        try:
+            base, r_map, g_map, b_map = cls.PACKED_ENCODINGS[depth]
+        except KeyError:
+            base, r_map, g_map, b_map = cls.PACKED_ENCODINGS[depth] = cls._packed_encoding(depth)
+
+        if isinstance(color, PackedColor):
+            return PackedColor(base | r_map[color >> 24 & 0xff] | g_map[color >> 16 & 0xff] |
+                               b_map[color >> 8 & 0xff] | color & 0xff)
+
+        r, g, b, brightness, _ = color
+        if not (0 <= r <= 0xff and 0 <= g <= 0xff and 0 <= b <= 0xff):
+            raise ValueError('Illegal color component value: r=%d, g=%d, b=%d' % (r, g, b))
+
+        if 0.0 > brightness or brightness > cls.MAX_BRIGHTNESS:
+            raise ValueError('Illegal brightness value: %f' % brightness)
+
+        return PackedColor(base | r_map[r] | g_map[g] | b_map[b] | int(round(brightness * PackedColor.BRIGHTNESS_MAX)))
+
+    @classmethod
+    def _packed_encoding(cls, depth: Depth):
+        """Returns the depth bits and the channel tables of encode, shifted to their position in a PackedColor"""
+        r_map, g_map, b_map = (cls.DEPTH_MAPPER.quantization(bits) for bits in (depth.r, depth.g, depth.b))
+        return (PackedColor.DEPTH_INDEX[depth] << 32, tuple(v << 24 for v in r_map), tuple(v << 16 for v in g_map),
+                tuple(v << 8 for v in b_map))
+
     @classmethod
     def set_brightness(cls, color: Color, brightness: float = 1.0) -> Color:
         return color._replace(brightness=brightness)
@@ -148,10 +285,194 @@ class Factory(abc.ABC):
 
         try:
             # RGB values are in max_depth so we have to create a new color at max_depth and map it back to color depth
-            return Factory.encode(Factory.color(r, g, b, color.brightness), color.depth)
+            shaded = Factory.encode(Factory.color(r, g, b, color.brightness), color.depth)
         except ValueError:
             raise ValueError('Component overflow. Shading not possible for factor: %f' % f)
 
+        return Factory.pack(shaded) if isinstance(color, PackedColor) else shaded
+
+
+class Gradient:
+    """Color gradient through a sequence of color stops
+
+    The gradient is precomputed into a table of packed colors, so sampling is O(1).
+    """
+
+    def __init__(self, stops: Sequence[Tuple[float, Color]], size: int = 256, depth: Depth = Depth.max_depth()):
+        if not stops:
+            raise ValueError('A gradient needs at least one color stop')
+
+        if not 1 < size:
+            raise ValueError('size must be greater than 1: %d' % size)
+
+        stops = sorted(stops, key=lambda x: x[0])
+        positions = [t for t, _ in stops]
+        if positions[0] < 0.0 or 1.0 < positions[-1]:
+            raise ValueError('Stop positions must be between 0.0 and 1.0: %s' % positions)
+
+        def get_color(t: float):
+            if t <= positions[0]:
+                return stops[0][1]
+            for (t0, c0), (t1, c1) in zip(stops, stops[1:]):
+                if t <= t1:
+                    f = (t - t0) / (t1 - t0) if t0 < t1 else 1.0
+                    r, g, b = (int(round(v0 + (v1 - v0) * f)) for v0, v1 in ((c0.r, c1.r), (c0.g, c1.g), (c0.b, c1.b)))
+                    return Color(r, g, b, c0.brightness + (c1.brightness - c0.brightness) * f, Depth.max_depth())
+            return stops[-1][1]
+
+        self.colors = tuple(Factory.pack(Factory.encode(get_color(i / (size - 1)), depth)) for i in range(size))
+        self._max_index = size - 1
+
+    def sample(self, t: float) -> PackedColor:
+        """Returns the color at position t, positions are capped to [0.0, 1.0]"""
+        i = int(t * self._max_index + 0.5)
+        return self.colors[0 if i < 0 else self._max_index if self._max_index < i else i]
+
+    def sample_many(self, positions: Sequence[float]):
+        """Returns the colors at the given positions as an array of packed colors, see Batch"""
+        if numpy is not None:
+            i = (numpy.asarray(positions, dtype=float) * self._max_index + 0.5).astype(numpy.int64)
+            return numpy.asarray(self.colors, dtype=numpy.int64)[numpy.clip(i, 0, self._max_index)]
+
+        return array.array('q', (self.sample(t) for t in positions))
+
+
+class Batch(abc.ABC):
+    """Batch conversions from other color spaces into arrays of packed colors
+
+    Results are NumPy int64 arrays if NumPy is available and array.array('q') otherwise, in both cases the values use
+    the PackedColor layout. NumPy is used for vectorized computations, without it precomputed lookup tables are used.
+    Saturation, value and lightness may be given as a sequence or as a single float applying to all colors.
+    """
+    HUE_LUT = tuple(colorsys.hsv_to_rgb(i / 4096, 1.0, 1.0) for i in range(4096))  # fully saturated hues
+    HUE_LUT_SIZE = len(HUE_LUT)
+    KELVIN_MIN = 1000
+    KELVIN_MAX = 40000
+    KELVIN_STEP = 100
+
+    @staticmethod
+    def kelvin_to_rgb(kelvin: float) -> Tuple[float, float, float]:
+        """Approximates the color of a black body at the given temperature (Tanner Helland)"""
+        t = kelvin / 100
+        r = 255.0 if t <= 66 else 329.698727446 * (t - 60) ** -0.1332047592
+        g = 99.4708025861 * math.log(t) - 161.1195681661 if t <= 66 else 288.1221695283 * (t - 60) ** -0.0755148492
+        b = 255.0 if 66 <= t else 0.0 if t <= 19 else 138.5177312231 * math.log(t - 10) - 305.0447927307
+        return tuple(min(max(c, 0.0), 255.0) / 255 for c in (r, g, b))
+
+    @classmethod
+    def hsv(cls, hues: Sequence[float], saturations: Union[float, Sequence[float]] = 1.0,
+            values: Union[float, Sequence[float]] = 1.0, brightness: float = Factory.MAX_BRIGHTNESS,
+            depth: Depth = Depth.max_depth()):
+        """Converts HSV colors, all components are between 0.0 and 1.0"""
+        if numpy is not None:
+            r, g, b = cls._np_hue(hues)
+            v = numpy.asarray(values, dtype=float)
+            c = v * numpy.asarray(saturations, dtype=float)
+            m = v - c
+            return cls._np_pack(m + c * r, m + c * g, m + c * b, brightness, depth)
+
+        def convert(h, s, v):
+            r, g, b = cls._lut_hue(h)
+            c = v * s
+            m = v - c
+            return m + c * r, m + c * g, m + c * b
+
+        return cls._pack(itertools.starmap(convert, zip(hues, cls._repeat(saturations), cls._repeat(values))),
+                         brightness, depth)
+
+    @classmethod
+    def hsl(cls, hues: Sequence[float], saturations: Union[float, Sequence[float]] = 1.0,
+            lightnesses: Union[float, Sequence[float]] = 0.5, brightness: float = Factory.MAX_BRIGHTNESS,
+            depth: Depth = Depth.max_depth()):
+        """Converts HSL colors, all components are between 0.0 and 1.0"""
+        if numpy is not None:
+            r, g, b = cls._np_hue(hues)
+            l = numpy.asarray(lightnesses, dtype=float)
+            c = (1.0 - numpy.abs(2.0 * l - 1.0)) * numpy.asarray(saturations, dtype=float)
+            m = l - c / 2
+            return cls._np_pack(m + c * r, m + c * g, m + c * b, brightness, depth)
+
+        def convert(h, s, l):
+            r, g, b = cls._lut_hue(h)
+            c = (1.0 - abs(2.0 * l - 1.0)) * s
+            m = l - c / 2
+            return m + c * r, m + c * g, m + c * b
+
+        return cls._pack(itertools.starmap(convert, zip(hues, cls._repeat(saturations), cls._repeat(lightnesses))),
+                         brightness, depth)
+
+    @classmethod
+    def kelvin(cls, temperatures: Sequence[float], brightness: float = Factory.MAX_BRIGHTNESS,
+               depth: Depth = Depth.max_depth()):
+        """Converts color temperatures in Kelvin, temperatures are capped to [KELVIN_MIN, KELVIN_MAX]"""
+        if numpy is not None:
+            t = numpy.clip(numpy.asarray(temperatures, dtype=float), cls.KELVIN_MIN, cls.KELVIN_MAX) / 100
+            warm = t <= 66
+            hot = numpy.maximum(t - 60, 1.0)
+            r = numpy.where(warm, 255.0, 329.698727446 * hot ** -0.1332047592)
+            g = numpy.where(warm, 99.4708025861 * numpy.log(t) - 161.1195681661, 288.1221695283 * hot ** -0.0755148492)
+            b = numpy.where(66 <= t, 255.0,
+                            numpy.where(t <= 19, 0.0, 138.5177312231 * numpy.log(numpy.maximum(t - 10, 1.0)) -
+                                        305.0447927307))
+            return cls._np_pack(*(numpy.clip(c, 0.0, 255.0) / 255 for c in (r, g, b)), brightness, depth)
+
+        lut = cls._kelvin_lut()
+        return cls._pack((lut[int((min(max(k, cls.KELVIN_MIN), cls.KELVIN_MAX) - cls.KELVIN_MIN) / cls.KELVIN_STEP +
+                                  0.5)] for k in temperatures), brightness, depth)
+
+    @classmethod
+    def gradient(cls, gradient: Gradient, positions: Sequence[float]):
+        """Samples the gradient at the given positions between 0.0 and 1.0"""
+        return gradient.sample_many(positions)
+
+    @classmethod
+    def colors(cls, packed) -> Sequence[PackedColor]:
+        """Wraps the values of a packed array into PackedColor objects"""
+        return [PackedColor(int(v)) for v in packed]
+
+    @classmethod
+    def _kelvin_lut(cls) -> Tuple[Tuple[float, float, float], ...]:
+        if not hasattr(cls, '_KELVIN_LUT'):
+            cls._KELVIN_LUT = tuple(cls.kelvin_to_rgb(k) for k in range(cls.KELVIN_MIN, cls.KELVIN_MAX + 1,
+                                                                         cls.KELVIN_STEP))
+        return cls._KELVIN_LUT
+
+    @staticmethod
+    def _repeat(v: Union[float, Sequence[float]]):
+        return itertools.repeat(v) if isinstance(v, (int, float)) else v
+
+    @classmethod
+    def _lut_hue(cls, h: float) -> Tuple[float, float, float]:
+        return cls.HUE_LUT[int(h % 1.0 * cls.HUE_LUT_SIZE + 0.5) % cls.HUE_LUT_SIZE]
+
+    @classmethod
+    def _pack(cls, rgbs, brightness: float, depth: Depth):
+        r_map, g_map, b_map = (Factory.DEPTH_MAPPER.quantization(bits) for bits in (depth.r, depth.g, depth.b))
+        base = PackedColor.of(0, 0, 0, brightness, depth)
+
+        def index(c: float) -> int:
+            # channels are clipped to [0.0, 1.0] like in _np_pack
+            return int((0.0 if c < 0.0 else 1.0 if 1.0 < c else c) * 255)
+
+        return array.array('q', (base | r_map[index(r)] << 24 | g_map[index(g)] << 16 | b_map[index(b)] << 8
+                                 for r, g, b in rgbs))
+
+    @staticmethod
+    def _np_hue(hues):
+        h6 = numpy.mod(numpy.asarray(hues, dtype=float), 1.0) * 6
+        return (numpy.clip(numpy.abs(h6 - 3) - 1, 0.0, 1.0),
+                numpy.clip(2 - numpy.abs(h6 - 2), 0.0, 1.0),
+                numpy.clip(2 - numpy.abs(h6 - 4), 0.0, 1.0))
+
+    @staticmethod
+    def _np_pack(r, g, b, brightness: float, depth: Depth):
+        r_map, g_map, b_map = (numpy.asarray(Factory.DEPTH_MAPPER.quantization(bits), dtype=numpy.int64)
+                               for bits in (depth.r, depth.g, depth.b))
+        channels = [m[(numpy.clip(c, 0.0, 1.0) * 255).astype(numpy.int64)] for m, c in ((r_map, r), (g_map, g),
+                                                                                      (b_map, b))]
+        base = int(PackedColor.of(0, 0, 0, brightness, depth))
+        return base | channels[0] << 24 | channels[1] << 16 | channels[2] << 8
+
 
 class NamedColor(abc.ABC):
     # Basic HTML color palette which can be properly displayed by LEDSHIM (https://en.wikipedia.org/wiki/Web_colors)
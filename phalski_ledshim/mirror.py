@@ -0,0 +1,161 @@
+from __future__ import absolute_import
+
+import abc
+import mmap
+import os
+import struct
+
+from typing import List, Optional, Sequence, Tuple
+
+from phalski_ledshim import color, client as ledshim_client
+
+__all__ = ['Factory', 'MirrorReader']
+
+
+class Mirror:
+    """Memory-mapped file holding the frame which is currently displayed
+
+    Layout is a header (magic, version, number of pixels, sequence number, global brightness, color depth index, see
+    PackedColor.DEPTHS) followed by 4 bytes per pixel: r, g, b and the brightness quantized to 8 bits. The sequence
+    number is odd while a frame is being written, so readers can detect torn reads without any locking. It wraps
+    around at 32 bits.
+    """
+    MAGIC = b'LSHM'
+    VERSION = 2
+    HEADER = struct.Struct('<4sHHIfB3x')
+    SEQ = struct.Struct('<I')
+    SEQ_OFFSET = 8
+    SEQ_MASK = 0xffffffff
+    FRAME = struct.Struct('<fB')  # brightness and depth, following the sequence number
+    PIXEL = struct.Struct('<4B')
+
+    def __init__(self, path: str, num_pixels: int):
+        self.path = path
+        self.num_pixels = num_pixels
+        self.seq = 0
+
+        size = self.HEADER.size + num_pixels * self.PIXEL.size
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            self._mm = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+        self.HEADER.pack_into(self._mm, 0, self.MAGIC, self.VERSION, num_pixels, self.seq, 0.0,
+                              color.PackedColor.DEPTH_INDEX[color.Depth.max_depth()])
+
+        # colors are packed as big endian 64-bit ints, so the low 32 bits of each are r, g, b and the brightness in
+        # PIXEL byte order and the whole frame can be copied into the file with a single strided copy
+        self._packed = struct.Struct('>%dQ' % num_pixels)
+        self._scratch = bytearray(self._packed.size)
+        self._scratch_pixels = memoryview(self._scratch).cast('I')[1::2]
+        self._pixels = memoryview(self._mm)[self.HEADER.size:].cast('I')
+
+    def write(self, colors: Sequence[color.PackedColor], brightness: float):
+        """Writes a complete frame of packed colors as handed to the driver by the client
+
+        An empty frame only updates the header.
+        """
+        mm = self._mm
+        self.seq = self.seq + 1 & self.SEQ_MASK
+        self.SEQ.pack_into(mm, self.SEQ_OFFSET, self.seq)
+
+        # all colors of a frame are encoded at the depth of the client
+        depth = colors[0] >> 32 if colors else color.PackedColor.DEPTH_INDEX[color.Depth.max_depth()]
+        self.FRAME.pack_into(mm, self.SEQ_OFFSET + self.SEQ.size, brightness, depth)
+        if colors:
+            self._packed.pack_into(self._scratch, 0, *colors)
+            self._pixels[:] = self._scratch_pixels
+
+        self.seq = self.seq + 1 & self.SEQ_MASK
+        self.SEQ.pack_into(mm, self.SEQ_OFFSET, self.seq)
+
+    def close(self):
+        self._pixels.release()
+        self._mm.close()
+
+
+class MirrorDriver(ledshim_client.Driver):
+    """Driver mirroring each shown frame into a memory-mapped file, all output is passed on to the wrapped driver"""
+
+    def __init__(self, driver: ledshim_client.Driver, path: str):
+        super().__init__(driver.num_pixels)
+        self.driver = driver
+        self.mirror = Mirror(path, driver.num_pixels)
+        self.brightness = 0.0
+        self._colors = ()  # type: Sequence[color.PackedColor]
+
+    def set_clear_on_exit(self, value: bool):
+        self.driver.set_clear_on_exit(value)
+
+    def set_brightness(self, brightness: float):
+        self.brightness = brightness
+        self.driver.set_brightness(brightness)
+
+    def set_pixel(self, x: int, r: int, g: int, b: int, brightness: float):
+        self.driver.set_pixel(x, r, g, b, brightness)
+
+    def set_pixels(self, colors: Sequence[color.PackedColor]):
+        self._colors = colors
+        self.driver.set_pixels(colors)
+
+    def show(self):
+        self.driver.show()
+        self.mirror.write(self._colors, self.brightness)
+
+
+class MirrorReader:
+    """Reads the frames mirrored by a MirrorDriver, e.g. from another process
+
+    The pixel data is exposed as a read-only memoryview of the mapped file, so it can be read without copying.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.num_pixels, _, _, _ = Mirror.HEADER.unpack_from(self._mm, 0)
+        if magic != Mirror.MAGIC or version != Mirror.VERSION:
+            raise ValueError('Not a mirror file: %s' % path)
+
+        self.pixels = memoryview(self._mm)[Mirror.HEADER.size:]
+
+    @property
+    def seq(self) -> int:
+        return Mirror.SEQ.unpack_from(self._mm, Mirror.SEQ_OFFSET)[0]
+
+    def read(self, retries: int = 100) -> Tuple[int, float, List[color.PackedColor]]:
+        """Returns a consistent copy of the current frame
+
+        :return: The sequence number, the global brightness and the pixel colors at the depth of the client
+        :raises RuntimeError: If no consistent frame could be read within the given number of retries
+        """
+        for _ in range(retries):
+            seq = self.seq
+            if seq % 2:
+                continue
+
+            _, _, _, _, brightness, depth = Mirror.HEADER.unpack_from(self._mm, 0)
+            depth = color.PackedColor.DEPTHS[depth]
+            colors = [color.PackedColor.of(r, g, b, q / 255, depth)
+                      for r, g, b, q in Mirror.PIXEL.iter_unpack(self.pixels)]
+            if seq == self.seq:
+                return seq, brightness, colors
+
+        raise RuntimeError('Failed to read a consistent frame')
+
+    def close(self):
+        self.pixels.release()
+        self._mm.close()
+
+
+class Factory(abc.ABC):
+
+    @classmethod
+    def driver(cls, path: str, driver: Optional[ledshim_client.Driver] = None) -> MirrorDriver:
+        return MirrorDriver(driver or ledshim_client.LedShimDriver(), path)
+
+    @classmethod
+    def reader(cls, path: str) -> MirrorReader:
+        return MirrorReader(path)
@@ -0,0 +1,68 @@
+from __future__ import absolute_import
+
+import abc
+
+from typing import List, Optional, Tuple, Union
+
+from phalski_ledshim import app, color, client as ledshim_client, clock as ledshim_clock
+
+__all__ = ['Factory']
+
+
+class OfflineClient(ledshim_client.Client):
+    """Client keeping track of the pixel state only, nothing is written to the LED SHIM"""
+
+    def __init__(self, brightness: float = color.Factory.MAX_BRIGHTNESS, clear_on_exit: bool = True,
+                 depth: color.Depth = color.Depth.BIT24):
+        super().__init__(brightness, clear_on_exit, depth, ledshim_client.NullDriver())
+
+
+class Renderer:
+    """Renders sources against a virtual clock as fast as possible
+
+    Sources are run the same way a worker runs them, but waiting only advances the virtual clock. The result is
+    deterministic for sources that read the time from their clock only.
+    """
+
+    def __init__(self, client: Optional[OfflineClient] = None, clock: Optional[ledshim_clock.VirtualClock] = None):
+        self.client = client or OfflineClient()
+        self.clock = clock or ledshim_clock.Factory.virtual_clock()
+
+    def render(self, delay: float, num_frames: int,
+               *args: Union[app.BaseColorSource, Tuple[app.BaseColorSource, float]]) -> List[List[color.Color]]:
+        """Renders up to num_frames frames of the given sources
+
+        :param delay: The worker delay, see App.configure_worker
+        :param num_frames: The maximum number of frames, less frames are returned if all sources are exhausted
+        :return: The pixel state of the client after each shown frame
+        """
+        source = app.MultiSource(*args, period=delay)
+        source.set_clock(self.clock)
+
+        frames = []
+        source.open()
+        try:
+            events = source.events()
+            while len(frames) < num_frames:
+                try:
+                    changes = next(events)
+                except StopIteration:
+                    break
+
+                self.client.apply_changes(changes)
+                self.client.show()
+                frames.append(list(self.client.state))
+
+                timeout = source.timeout()
+                self.clock.advance(delay if timeout is None else min(timeout, delay))
+        finally:
+            source.close()
+
+        return frames
+
+
+class Factory(abc.ABC):
+
+    @classmethod
+    def renderer(cls, start: float = 0.0, depth: color.Depth = color.Depth.BIT24) -> Renderer:
+        return Renderer(OfflineClient(depth=depth), ledshim_clock.Factory.virtual_clock(start))
@@ -0,0 +1,100 @@
+from __future__ import absolute_import
+
+import collections
+import itertools
+import json
+import os
+import signal
+import threading
+import time
+
+from typing import Dict, List, Optional, Sequence, Union
+
+__all__ = ['Tracer']
+
+
+class Tracer:
+    """Records spans of the frame pipeline and exports them as Chrome trace events
+
+    Each rendered frame gets an id which is unique across all workers, spans of the same frame carry the same id and
+    show spans carry the ids of all frames they display. Spans are only recorded while the tracer is enabled and only
+    for every n-th frame id, which keeps the overhead low enough to leave the tracer in place. Exported files can be
+    opened with chrome://tracing or Perfetto.
+    """
+
+    def __init__(self, enabled: bool = False, sample_interval: int = 1, max_spans: int = 100000,
+                 path: Optional[str] = None):
+        if not 0 < sample_interval:
+            raise ValueError('sample_interval must be greater than 0: %d' % sample_interval)
+
+        self.enabled = enabled
+        self.sample_interval = sample_interval
+        self.path = path
+        self.spans = collections.deque(maxlen=max_spans)
+        self.thread_names = {}  # type: Dict[int, str]
+        self._frame_ids = itertools.count()
+
+    def next_frame_id(self) -> int:
+        """Returns a new frame id, safe to call from multiple threads"""
+        return next(self._frame_ids)
+
+    def is_sampled(self, frame_id: int) -> bool:
+        return frame_id % self.sample_interval == 0
+
+    def begin(self, *args: int) -> Optional[float]:
+        """Returns the start time for a span of the given frames or None if none of the frames is traced"""
+        if self.enabled and any(self.is_sampled(frame_id) for frame_id in args):
+            return time.perf_counter()
+        return None
+
+    def end(self, name: str, frame_ids: Union[int, Sequence[int]], start: Optional[float], tid: Optional[int] = None):
+        """Records a span started with begin, by default on the current thread"""
+        if start is None:
+            return
+
+        end = time.perf_counter()
+        if tid is None:
+            tid = threading.get_ident()
+            if tid not in self.thread_names:
+                self.thread_names[tid] = threading.current_thread().name
+
+        self.spans.append((name, frame_ids, tid, start, end))
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def toggle(self):
+        if self.enabled:
+            self.disable()
+            if self.path:
+                self.dump(self.path)
+        else:
+            self.enable()
+
+    def install_signal_handler(self, signum: int = signal.SIGUSR1):
+        """Toggles the tracer on the given signal, spans are dumped to path (if set) when tracing is turned off
+
+        Must be called from the main thread.
+        """
+        signal.signal(signum, lambda *_: self.toggle())
+
+    def clear(self):
+        self.spans.clear()
+
+    def trace_events(self) -> List[dict]:
+        pid = os.getpid()
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                  for tid, name in list(self.thread_names.items())]
+        for name, frame_ids, tid, start, end in list(self.spans):
+            args = {'frame': frame_ids} if isinstance(frame_ids, int) else {'frames': list(frame_ids)}
+            events.append({'name': name, 'ph': 'X', 'pid': pid, 'tid': tid,
+                           'ts': start * 1e6, 'dur': (end - start) * 1e6, 'args': args})
+
+        return events
+
+    def dump(self, path: str):
+        with open(path, 'w') as fh:
+            json.dump({'traceEvents': self.trace_events(), 'displayTimeUnit': 'ms'}, fh)
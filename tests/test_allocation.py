@@ -0,0 +1,82 @@
+import itertools
+import tracemalloc
+
+import pytest
+
+from phalski_ledshim import animation, app, chart, clock, color
+
+PIXELS = list(range(28))
+
+
+def allocated(f, *args):
+    """Returns the most memory in bytes held at once by objects f allocates, even if they are freed again"""
+    start, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    f(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    return peak - start
+
+
+def loop(n):
+    for _ in range(n):
+        pass
+
+
+def max_allocated_per_frame(source, num_frames=200, warm_up=20):
+    """Returns the most memory allocated while rendering any single frame of the source"""
+    source.set_clock(clock.Factory.virtual_clock())
+    events = source.events()
+    for _ in itertools.islice(events, warm_up):
+        source.clock.advance(0.01)
+
+    tracemalloc.start()
+    try:
+        result = 0
+        for _ in range(num_frames):
+            try:
+                result = max(result, allocated(next, events))
+            except StopIteration:
+                break
+            source.clock.advance(0.01)
+        return result
+    finally:
+        tracemalloc.stop()
+
+
+def loop_overhead():
+    """Any for loop allocates its iterator, which is the only allocation rendering may do"""
+    tracemalloc.start()
+    try:
+        loop(len(PIXELS))
+        return allocated(loop, len(PIXELS))
+    finally:
+        tracemalloc.stop()
+
+
+def cycle(n):
+    values = itertools.cycle([i / n for i in range(n)])
+    return lambda: next(values)
+
+
+@pytest.mark.parametrize('factory', [
+    lambda: animation.Rainbow(PIXELS, 60),
+    lambda: animation.LedTest(PIXELS),
+    lambda: chart.Factory.bar_chart_source(PIXELS, cycle(10)),
+    lambda: chart.Factory.red_blue_bar_chart_source(PIXELS, cycle(10), cycle(5)),
+    lambda: chart.Factory.bin_number_source(PIXELS, lambda: 123456789),
+    lambda: chart.Factory.red_blue_bin_number_source(PIXELS, lambda: 123456, lambda: 98765432),
+    lambda: chart.Factory.health_stat_source(PIXELS, cycle(10), chart.Factory.spec(0.0, 1.0, True), 0.5, 0.7),
+], ids=['rainbow', 'led_test', 'bar_chart', 'red_blue_bar_chart', 'bin_number', 'red_blue_bin_number', 'health_stat'])
+def test_render_does_not_allocate_per_frame(factory):
+    # the value cycles and the color cache of the red blue bar chart are filled during the warm up
+    assert max_allocated_per_frame(factory()) <= loop_overhead()
+
+
+class AllocatingSource(app.InfiniteColorSource):
+
+    def get_colors(self, num_pixels: int):
+        return {i: color.Factory.color(i, 0, 0) for i in range(num_pixels)}
+
+
+def test_allocations_within_a_frame_are_detected():
+    assert loop_overhead() < max_allocated_per_frame(AllocatingSource(PIXELS))
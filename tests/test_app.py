@@ -0,0 +1,92 @@
+import queue
+import threading
+
+import pytest
+
+from phalski_ledshim import app, client, clock, color
+
+
+class CountingSource(app.BaseColorSource):
+
+    def __init__(self, length: int = -1):
+        super().__init__()
+        self.length = length
+        self.count = 0
+        self.closed = False
+
+    def events(self):
+        while self.count != self.length:
+            self.count += 1
+            yield [client.Factory.change_event(color.NamedColor.RED, 0)]
+
+    def close(self):
+        self.closed = True
+
+
+class AppClock(clock.VirtualClock):
+    """Virtual clock picking up the frames of a worker every app delay, the way App.run does"""
+
+    def __init__(self, app_delay: float, duration: float):
+        super().__init__()
+        self.app_delay = app_delay
+        self.duration = duration
+        self.next_pickup = 0.0
+        self.worker = None
+
+    def wait(self, event: threading.Event, timeout: float) -> bool:
+        end = self.now + timeout
+        while self.next_pickup <= end and not event.is_set():
+            self.now = max(self.now, self.next_pickup)
+            self.next_pickup += self.app_delay
+            try:
+                self.worker.queue.get_nowait()
+                self.worker.picked_up.set()
+            except queue.Empty:
+                pass
+
+        if not event.is_set():
+            self.now = end
+
+        if self.duration <= self.now:
+            self.worker.shutdown.set()
+
+        return event.is_set()
+
+
+def run_worker(delay: float, *args, app_delay: float = 0.01, duration: float = 3.0):
+    c = AppClock(app_delay, duration)
+    source = app.MultiSource(*args, period=delay)
+    source.set_clock(c)
+    worker = app.Worker('test', source, threading.Event(), delay, clock=c)
+    c.worker = worker
+    worker.run()
+
+
+@pytest.mark.parametrize('delay', [1.0, 0.1])
+def test_worker_runs_children_at_their_period(delay):
+    fast, slow = CountingSource(), CountingSource()
+    run_worker(delay, (fast, 0.02), slow)
+
+    assert 145 <= fast.count <= 152
+    assert 3.0 / delay - 1 <= slow.count <= 3.0 / delay + 1
+
+
+def test_worker_is_limited_by_app_pickup():
+    fast = CountingSource()
+    run_worker(1.0, (fast, 0.02), app_delay=0.1)
+
+    assert 28 <= fast.count <= 32
+
+
+def test_multi_source_closes_exhausted_sources():
+    a, b, c = CountingSource(2), CountingSource(4), CountingSource(3)
+    source = app.MultiSource(a, b, c)
+
+    assert [len(events) for events in source.events()] == [3, 3, 2, 1, 0]
+    assert a.closed and b.closed and c.closed
+    assert source.sources == []
+
+
+def test_app_rejects_virtual_clock():
+    with pytest.raises(ValueError):
+        app.App(client=client.Factory.client(driver=client.NullDriver()), clock=clock.Factory.virtual_clock())
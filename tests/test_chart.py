@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from phalski_ledshim import chart, clock
+
+DELAY = 0.1
+
+
+def count_samples(ttl, jitter, num_renders=30):
+    """Renders a chart reading a registered metric twice per render, returns the number of samples taken"""
+    c = clock.Factory.virtual_clock()
+    registry = chart.Factory.sample_registry(ttl, c)
+    samples = []
+    wave = registry.register('wave', lambda: samples.append(c.time()) or 0.5)
+    source = chart.Factory.red_blue_bar_chart_source(list(range(28)), wave, lambda: 1 - wave())
+    source.set_clock(c)
+
+    rnd = random.Random(42)
+    events = source.events()
+    for _ in range(num_renders):
+        next(events)
+        c.advance(DELAY + rnd.uniform(-jitter, jitter))
+
+    return len(samples)
+
+
+@pytest.mark.parametrize('jitter', [0.0, 0.02, 0.04])
+def test_registry_samples_once_per_render(jitter):
+    assert count_samples(DELAY / 2, jitter) == 30
+
+
+def test_registry_reuses_samples_of_early_renders_if_ttl_is_the_delay():
+    assert count_samples(DELAY, 0.02) < 30
+
+
+@pytest.mark.parametrize('ttl', [0.0, -0.1])
+def test_registry_requires_a_positive_ttl(ttl):
+    with pytest.raises(ValueError):
+        chart.Factory.sample_registry(ttl)
+
+    with pytest.raises(ValueError):
+        chart.Factory.sample_registry(DELAY).register('m', lambda: 1.0, ttl)
+
+
+def test_registry_samples_once_per_instant():
+    c = clock.Factory.virtual_clock()
+    samples = []
+    value = chart.Factory.sample_registry(DELAY, c).register('m', lambda: samples.append(c.time()) or 1.0)
+
+    assert value() == value() == 1.0
+    assert len(samples) == 1
+
+
+def test_registry_rejects_duplicate_metrics():
+    registry = chart.Factory.sample_registry(DELAY)
+    registry.register('m', lambda: 1.0)
+
+    with pytest.raises(ValueError):
+        registry.register('m', lambda: 2.0)
+
+    with pytest.raises(KeyError):
+        registry.source('unknown')
@@ -0,0 +1,48 @@
+from phalski_ledshim import client, color
+
+
+def create_client():
+    return client.Factory.client(driver=client.NullDriver())
+
+
+def test_state_is_published_on_show():
+    c = create_client()
+    red = color.Factory.encode_packed(color.NamedColor.RED, c.depth)
+    initial = c.state
+
+    c.set_pixel(0, color.NamedColor.RED)
+    assert c.state is initial
+
+    c.show()
+    shown = c.state
+    assert shown[0] == red
+    assert shown[1:] == initial[1:]
+
+    c.set_all(color.NamedColor.BLUE)
+    c.clear()
+    assert c.state is shown
+
+    c.show()
+    assert c.state == initial
+
+
+def test_snapshot_sequence_increments_once_per_show():
+    c = create_client()
+    seq, state = c.snapshot()
+    assert state is c.state
+
+    for i in range(1, 4):
+        c.set_pixel(i, color.NamedColor.GREEN)
+        assert c.snapshot()[0] == seq + i - 1
+
+        c.show()
+        assert c.snapshot() == (seq + i, c.state)
+
+
+def test_show_without_changes_publishes_equal_state():
+    c = create_client()
+    seq, state = c.snapshot()
+
+    c.show()
+
+    assert c.snapshot() == (seq + 1, state)
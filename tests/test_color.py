@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from phalski_ledshim import client, color
+
+
+@pytest.mark.parametrize('args', [(0, 0, 0, 1.5), (0, 0, 0, -0.1), (256, 0, 0, 1.0), (0, -1, 0, 1.0), (0, 0, 300, 1.0)])
+def test_packed_color_rejects_illegal_values(args):
+    with pytest.raises(ValueError):
+        color.PackedColor.of(*args, color.Depth.BIT24)
+
+
+def test_packed_color_round_trip():
+    c = color.Factory.color(1, 2, 3, 0.4, color.Depth.BIT16)
+    p = color.Factory.pack(c)
+
+    assert (p.r, p.g, p.b, p.depth) == (c.r, c.g, c.b, c.depth)
+    assert p.brightness == round(0.4 * 255) / 255
+    assert color.Factory.unpack(p) == c._replace(brightness=p.brightness)
+
+
+@pytest.mark.parametrize('depth', list(color.Depth))
+def test_encode_packed_matches_encode(depth):
+    rnd = random.Random(depth.name)
+    for _ in range(1000):
+        c = color.Color(rnd.randrange(256), rnd.randrange(256), rnd.randrange(256), rnd.random(), color.Depth.BIT24)
+        expected = color.Factory.pack(color.Factory.encode(c, depth))
+
+        assert color.Factory.encode_packed(c, depth) == expected
+        assert color.Factory.encode(color.Factory.pack(c), depth) == expected
+
+
+class CountingDriver(client.NullDriver):
+    set_pixels = client.Driver.set_pixels  # the change detection of the default driver
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def set_pixel(self, x: int, r: int, g: int, b: int, brightness: float):
+        self.writes += 1
+
+
+def test_client_writes_changed_pixels_only():
+    driver = CountingDriver()
+    c = client.Factory.client(depth=color.Depth.BIT16, driver=driver)
+    red = color.NamedColor.RED
+
+    c.set_all(red)
+    c.show()
+    c.set_pixel(0, color.Factory.pack(red))
+    c.set_pixel(1, color.Factory.unpack(red))
+    c.show()
+
+    assert driver.writes == client.NUM_PIXELS
+    assert all(isinstance(p, color.PackedColor) for p in c.state)
+
+
+def batch_conversions():
+    hues = [i / 97 for i in range(-50, 150)]
+    levels = [i / 50 - 1.0 for i in range(len(hues))]  # includes values outside of [0.0, 1.0]
+    return [
+        lambda: color.Batch.hsv(hues, levels, [1.0 - v for v in levels], 0.5, color.Depth.BIT16),
+        lambda: color.Batch.hsl(hues, 1.0, levels, 1.0, color.Depth.BIT8),
+        lambda: color.Batch.kelvin([i * 250 for i in range(len(hues))], 0.8),
+    ]
+
+
+@pytest.mark.parametrize('convert', batch_conversions(), ids=['hsv', 'hsl', 'kelvin'])
+def test_batch_lookup_tables_clip_channels(convert, monkeypatch):
+    monkeypatch.setattr(color, 'numpy', None)
+    colors = color.Batch.colors(convert())
+
+    assert all(0 <= c.r <= 255 and 0 <= c.g <= 255 and 0 <= c.b <= 255 for c in colors)
+
+
+@pytest.mark.parametrize('convert', batch_conversions(), ids=['hsv', 'hsl', 'kelvin'])
+def test_batch_numpy_and_lookup_tables_agree(convert, monkeypatch):
+    pytest.importorskip('numpy')
+    vectorized = color.Batch.colors(convert())
+    monkeypatch.setattr(color, 'numpy', None)
+    looked_up = color.Batch.colors(convert())
+
+    assert len(vectorized) == len(looked_up)
+    for v, l in zip(vectorized, looked_up):
+        # the lookup tables quantize hues and temperatures, which may shift a channel by one step of the depth (<= 8)
+        assert (v.depth, v.brightness) == (l.depth, l.brightness)
+        assert all(abs(a - b) <= 8 for a, b in zip((v.r, v.g, v.b), (l.r, l.g, l.b))), (v, l)
@@ -0,0 +1,58 @@
+from phalski_ledshim import client, color, mirror
+
+
+def create_client(path: str, depth: color.Depth = color.Depth.BIT24):
+    driver = mirror.Factory.driver(path, client.NullDriver())
+    return client.Factory.client(0.7, depth=depth, driver=driver), driver
+
+
+def test_read_shown_frame(tmp_path):
+    path = str(tmp_path / 'mirror')
+    c, _ = create_client(path, color.Depth.BIT16)
+    c.set_pixel(3, color.Factory.color(10, 20, 30, 0.5))
+    c.show()
+
+    seq, brightness, colors = mirror.Factory.reader(path).read()
+
+    assert seq == 2
+    assert abs(brightness - 0.7) < 1e-6
+    assert len(colors) == client.NUM_PIXELS
+    assert colors[3] == color.Factory.pack(c.state[3]._replace(brightness=128 / 255))
+    assert colors[3].depth == color.Depth.BIT16
+
+
+def test_sequence_number_wraps(tmp_path):
+    path = str(tmp_path / 'mirror')
+    c, driver = create_client(path)
+    reader = mirror.Factory.reader(path)
+    driver.mirror.seq = 2 ** 32 - 2
+
+    c.show()
+    assert reader.seq == 0
+    c.show()
+    assert reader.read()[0] == 2
+
+
+def test_read_all_pixels(tmp_path):
+    path = str(tmp_path / 'mirror')
+    c, _ = create_client(path, color.Depth.BIT16)
+    for x in c.pixels:
+        c.set_pixel(x, color.Factory.color(x * 9, 255 - x, x, x / 27))
+    c.show()
+
+    _, _, colors = mirror.Factory.reader(path).read()
+
+    assert colors == list(c.state)
+
+
+def test_empty_frame_keeps_pixels(tmp_path):
+    path = str(tmp_path / 'mirror')
+    m = mirror.Mirror(path, 3)
+    red = color.Factory.packed_color(255, 0, 0)
+    m.write([red] * 3, 1.0)
+    m.write([], 0.5)
+
+    seq, brightness, colors = mirror.Factory.reader(path).read()
+
+    assert (seq, brightness) == (4, 0.5)
+    assert colors == [red] * 3
@@ -0,0 +1,42 @@
+import threading
+
+from phalski_ledshim import animation, clock, offline
+
+
+def test_virtual_clock_advances_on_wait():
+    c = clock.Factory.virtual_clock(10.0)
+    event = threading.Event()
+
+    assert not c.wait(event, 0.5)
+    assert c.time() == c.monotonic() == 10.5
+
+    event.set()
+    assert c.wait(event, 0.5)
+    assert c.time() == 10.5
+
+
+def test_render_is_deterministic():
+    def render():
+        renderer = offline.Factory.renderer()
+        return renderer.render(0.05, 100, animation.Rainbow(list(range(14)), 60),
+                               (animation.LedTest(list(range(14, 28))), 0.01))
+
+    frames = render()
+
+    assert len(frames) == 100
+    assert frames == render()
+
+
+def test_render_advances_virtual_clock():
+    renderer = offline.Factory.renderer()
+    renderer.render(0.1, 50, animation.Rainbow(list(range(28))))
+
+    assert abs(renderer.clock.time() - 5.0) < 1e-6
+
+
+def test_render_stops_when_sources_are_exhausted():
+    frames = offline.Factory.renderer().render(0.1, 100, animation.LedTest(list(range(3))))
+
+    # 3 colors * 3 pixels, one clearing frame and the final empty frame of the multi source
+    assert len(frames) == 11
+    assert all(c.r == c.g == c.b == 0 for c in frames[-1][:3])
@@ -0,0 +1,56 @@
+import json
+import time
+
+from phalski_ledshim import animation, app, client, trace
+
+
+def run_app(tracer: trace.Tracer, duration: float = 0.3):
+    a = app.App(0.01, client.Factory.client(driver=client.NullDriver()), tracer)
+    a.configure_worker(0.01, animation.Rainbow(a.pixels[:14], 60))
+    a.configure_worker(0.02, animation.Rainbow(a.pixels[14:], 60))
+    a.start()
+    time.sleep(duration)
+    a.stop_workers()
+    a.join()
+
+
+def test_frame_ids_follow_frames_through_the_pipeline():
+    tracer = trace.Tracer(enabled=True, sample_interval=3)
+    run_app(tracer)
+
+    spans = {}
+    for name, frame_ids, _, _, _ in tracer.spans:
+        spans.setdefault(name, []).append(frame_ids)
+
+    renders = spans['render']
+    assert len(renders) == len(set(renders))
+    assert all(tracer.is_sampled(frame_id) for frame_id in renders)
+
+    shown = set(frame_id for frame_ids in spans['show'] for frame_id in frame_ids)
+    for frame_id in spans['apply_changes']:
+        assert frame_id in renders
+        assert frame_id in spans['queue']
+        assert frame_id in shown
+
+    # every show span contains at least one sampled frame
+    assert all(any(tracer.is_sampled(frame_id) for frame_id in frame_ids) for frame_ids in spans['show'])
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = trace.Tracer()
+    run_app(tracer, 0.1)
+
+    assert not tracer.spans
+
+
+def test_dump_chrome_trace(tmp_path):
+    tracer = trace.Tracer(enabled=True)
+    run_app(tracer, 0.1)
+    path = str(tmp_path / 'trace.json')
+    tracer.dump(path)
+
+    with open(path) as fh:
+        events = json.load(fh)['traceEvents']
+
+    assert {'render', 'queue', 'apply_changes', 'show', 'thread_name'} <= {e['name'] for e in events}
+    assert all('frames' in e['args'] for e in events if e['name'] == 'show')